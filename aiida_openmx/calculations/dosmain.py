@@ -18,8 +18,17 @@ class DosmainCalculation(CalcJob):
     _INPUT_FILE = 'aiida.in'
     _OUTPUT_FILE = 'aiida.out'
 
+    # pylint: disable=unsubscriptable-object
+    _DOS_VAL_FILE = OpenmxCalculation.dos_filenames['val']
+    _DOS_VEC_FILE = OpenmxCalculation.dos_filenames['vec']
+    _DOS_VAL_DEST = os.path.join(_DATA_PATH, _DOS_VAL_FILE)
+    _DOS_VEC_DEST = os.path.join(_DATA_PATH, _DOS_VEC_FILE)
+
     _DEFAULT_PARSER_NAME = 'openmx.dosmain'
 
+    # Suffixes of the DOS output files written for each (dos_type, dos_method)
+    _DOS_OUTPUT_SUFFIXES = {('dos', 'tetrahedron'): '.DOS.Tetrahedron', ('dos', 'gaussian'): '.DOS.Gaussian'}
+
     @classmethod
     def define(cls, spec):
         """Define the inputs and outputs of the Calculation."""
@@ -52,7 +61,8 @@ class DosmainCalculation(CalcJob):
         ## Outputs
         spec.output('output_dos', valid_type=orm.ArrayData, required=False,
             help='The `output_dos` output node of the successful calculation if present. '
-                 'Each DOS array in `output_dos` has three columns: energy [eV], DOS [eV^-1], integrated DOS.')
+                 'It contains the `energies` array [eV] and the `dos` array, whose columns are the DOS [eV^-1] and '
+                 'integrated DOS at each energy.')
 
         ## Errors
         # Unrecoverable errors: required retrieve files could not be read, parsed, or are otherwise incomplete
@@ -87,19 +97,11 @@ class DosmainCalculation(CalcJob):
         """
         self._validate_inputs()
 
-        dos_filenames = OpenmxCalculation.dos_filenames
-
+        computer_uuid = self.inputs.openmx_output_folder.computer.uuid
+        remote_path = self.inputs.openmx_output_folder.get_remote_path()
         remote_symlink_list = [
-            (
-                self.inputs.openmx_output_folder.computer.uuid,
-                os.path.join(self.inputs.openmx_output_folder.get_remote_path(),
-                             dos_filenames['val']), os.path.join(self._DATA_PATH, dos_filenames['val'])
-            ),
-            (
-                self.inputs.openmx_output_folder.computer.uuid,
-                os.path.join(self.inputs.openmx_output_folder.get_remote_path(),
-                             dos_filenames['vec']), os.path.join(self._DATA_PATH, dos_filenames['vec'])
-            ),
+            (computer_uuid, os.path.join(remote_path, self._DOS_VAL_FILE), self._DOS_VAL_DEST),
+            (computer_uuid, os.path.join(remote_path, self._DOS_VEC_FILE), self._DOS_VEC_DEST),
         ]
 
         retrieve_list = self._generate_retrieve_list()
@@ -110,7 +112,7 @@ class DosmainCalculation(CalcJob):
 
         # Fill out the `CodeInfo`
         codeinfo = datastructures.CodeInfo()
-        codeinfo.cmdline_params = ([dos_filenames['val'], dos_filenames['vec']])
+        codeinfo.cmdline_params = [self._DOS_VAL_FILE, self._DOS_VEC_FILE]
         codeinfo.stdin_name = self._INPUT_FILE
         codeinfo.stdout_name = self._OUTPUT_FILE
         codeinfo.code_uuid = self.inputs.code.uuid
@@ -127,18 +129,21 @@ class DosmainCalculation(CalcJob):
         return calcinfo
 
     def _validate_inputs(self):
-        if self.inputs.dos_method not in ['tetrahedron', 'gaussian']:
+        dos_type = self.inputs.dos_type.value
+        dos_method = self.inputs.dos_method.value
+
+        if dos_method not in ['tetrahedron', 'gaussian']:
             raise exceptions.InputValidationError(
-                f'`dos_method` should be `tetrahedron` or `gaussian`, not {self.inputs.dos_method.value}'
+                f'`dos_method` should be `tetrahedron` or `gaussian`, not {dos_method}'
             )
 
-        if self.inputs.dos_method == 'gaussian':
+        if dos_method == 'gaussian':
             if 'gaussian_broadening' not in self.inputs:
                 raise exceptions.InputValidationError(
                     '`gaussian_broadening` must be provided if `dos_method` is `gaussian`'
                 )
 
-        if self.inputs.dos_type == 'pdos':
+        if dos_type == 'pdos':
             required_inputs_pdos = ['pdos_atom_indices', 'openmx_input_structure', 'openmx_orbital_configurations']
             for required_input in required_inputs_pdos:
                 if required_input not in self.inputs:
@@ -147,37 +152,34 @@ class DosmainCalculation(CalcJob):
                     )
 
     def _generate_retrieve_list(self):
-        dos_type = self.inputs.dos_type
-        dos_method = self.inputs.dos_method
+        dos_type = self.inputs.dos_type.value
+        dos_method = self.inputs.dos_method.value
 
-        if dos_type == 'dos':
-            if dos_method == 'tetrahedron':
-                dos_output_filename = OpenmxCalculation.system_name + '.DOS.Tetrahedron'
-            else:  # gaussian
-                dos_output_filename = OpenmxCalculation.system_name + '.DOS.Gaussian'
-            return [dos_output_filename]
-        # pdos
-        # TODO: get number, order, and symbols of species and their orbital configurations
-        raise exceptions.FeatureNotAvailable(f'{dos_type} is not yet supported.')
+        try:
+            return [OpenmxCalculation.system_name + self._DOS_OUTPUT_SUFFIXES[(dos_type, dos_method)]]
+        except KeyError:
+            # pdos
+            # TODO: get number, order, and symbols of species and their orbital configurations
+            raise exceptions.FeatureNotAvailable(f'{dos_type} is not yet supported.') from None
 
     def _write_input_file(self):
-        dos_type = self.inputs.dos_type
-        dos_method = self.inputs.dos_method
-        input_file_content = ''
+        dos_type = self.inputs.dos_type.value
+        dos_method = self.inputs.dos_method.value
+        lines = []
 
         if dos_method == 'tetrahedron':
-            input_file_content += '1\n'
+            lines.append('1')
 
         if dos_method == 'gaussian':
-            input_file_content += '2\n'
-            input_file_content += '{:0.12f}\n'.format(self.inputs.gaussian_broadening.value)
+            lines.append('2')
+            lines.append('{:0.12f}'.format(self.inputs.gaussian_broadening.value))
 
         if dos_type == 'dos':
-            input_file_content += '1\n'
+            lines.append('1')
 
         if dos_type == 'pdos':
-            input_file_content += '2\n'
+            lines.append('2')
             atom_indices = self.inputs.pdos_atom_indices.get_array('atom_indices')
-            input_file_content += ' '.join([f'{atom_index:d}' for atom_index in atom_indices]) + '\n'
+            lines.append(' '.join(map('{:d}'.format, atom_indices)))
 
-        return input_file_content
+        return '\n'.join(lines) + '\n'
@@ -2,12 +2,19 @@
 """Input utilities and constants for `openmx`."""
 
 from os.path import splitext
+import collections
 import functools
+import io
 
 import jsonschema
 import numpy as np
 
-_RESERVED_KEYWORDS = [
+try:
+    import jsonschema_rs
+except ImportError:
+    jsonschema_rs = None
+
+_RESERVED_KEYWORDS = frozenset([
     'SYSTEM_CURRRENTDIRECTORY',
     'SYSTEM_NAME',
     'DATA_PATH',
@@ -26,9 +33,25 @@ _RESERVED_KEYWORDS = [
     'SCF_RESTART',
     'SCF_RESTART_FILENAME',
     # 'DOS_FILEOUT', 'DOSGAUSS_FILEOUT', 'FERMISURFER_FILEOUT', 'HS_FILEOUT'
-]
+])
 
 _FORMAT_TYPE_MAPPING = {'number': '{:0.12f}', 'integer': '{:d}', 'string': '{}'}
+_PRINTF_TYPE_MAPPING = {'number': '%0.12f', 'integer': '%d', 'string': '%s'}
+_DEF_ATOMIC_SPECIES_ROW_FORMAT = '{} {}-{} {}'.format
+_ORBITAL_LETTERS = ('s', 'p', 'd', 'f')
+_ATOMS_SPEC_AND_COORDS_FORMAT = ['%d', '%s', '%0.12f', '%0.12f', '%0.12f', '%0.6f', '%0.6f']
+
+# Validators and parameter writers built from a schema, keyed by `id(schema)`; the schema is stored alongside so that
+# its id cannot be recycled by another object while the entry is cached
+_VALIDATOR_CACHE = {}
+_RS_VALIDATOR_CACHE = {}
+_WRITER_CACHE = {}
+
+# Least-recently-used cache of the properties of stored pseudopotential and orbital nodes, keyed by `(uuid, name)`;
+# stored nodes are immutable, so the cached values cannot go stale and calculations reusing the same nodes do not query
+# their attributes again
+_NODE_PROPERTY_CACHE = collections.OrderedDict()
+_NODE_PROPERTY_CACHE_SIZE = 1024
 
 
 def _get_is_int(validator):
@@ -36,7 +59,7 @@ def _get_is_int(validator):
 
     # pylint: disable=unused-argument
     def is_int(checker, instance):
-        return (validator.TYPE_CHECKER.is_type(instance, 'integer') or isinstance(instance, (np.int32, np.int64)))
+        return validator.TYPE_CHECKER.is_type(instance, 'integer') or isinstance(instance, np.integer)
 
     return is_int
 
@@ -44,14 +67,11 @@ def _get_is_int(validator):
 def _get_is_number(validator):
     """Create a number type checker with numpy support for the given validator."""
 
-    # pylint: disable=unused-argument,consider-merging-isinstance
+    # pylint: disable=unused-argument
     def is_number(checker, instance):
-        return (
-            validator.TYPE_CHECKER.is_type(instance, 'number') or isinstance(instance,
-                                                                             (np.int16, np.int32, np.int64)) or
-            isinstance(instance, (np.float16, np.float32, np.float64, np.float128)) or
-            isinstance(instance, (np.complex64, np.complex128, np.complex256))
-        )
+        # `np.number` covers all numpy integer, floating and complex scalar types, including the extended-precision
+        # ones (e.g. `np.float128`) which only exist on some platforms
+        return validator.TYPE_CHECKER.is_type(instance, 'number') or isinstance(instance, np.number)
 
     return is_number
 
@@ -67,43 +87,132 @@ def _get_is_array(validator):
 
 
 def _get_validator(schema):
-    """Create a custom validator with numpy support for the given schema."""
+    """Create a custom validator with numpy support for the given schema, reusing a cached one if available."""
+    try:
+        return _VALIDATOR_CACHE[id(schema)][1]
+    except KeyError:
+        pass
     validator = jsonschema.validators.validator_for(schema)
     type_checker = validator.TYPE_CHECKER
     type_checker = type_checker.redefine('integer', _get_is_int(validator))
     type_checker = type_checker.redefine('number', _get_is_number(validator))
     type_checker = type_checker.redefine('array', _get_is_array(validator))
     OpenmxValidator = jsonschema.validators.extend(validator, type_checker=type_checker)
-    return OpenmxValidator(schema)
+    _VALIDATOR_CACHE[id(schema)] = (schema, OpenmxValidator(schema))
+    return _VALIDATOR_CACHE[id(schema)][1]
+
+
+def _get_rs_validator(schema):
+    """Create a `jsonschema_rs` validator for the given schema, reusing a cached one if available."""
+    try:
+        return _RS_VALIDATOR_CACHE[id(schema)][1]
+    except KeyError:
+        pass
+    _RS_VALIDATOR_CACHE[id(schema)] = (schema, jsonschema_rs.validator_for(schema))
+    return _RS_VALIDATOR_CACHE[id(schema)][1]
+
+
+def _to_json_types(instance):
+    """Recursively convert numeric numpy scalars and arrays to the equivalent Python types.
+
+    Containers are only copied if they hold a value which needs to be converted, so parameters without numpy values are
+    returned as they are. Tuples are accepted as arrays by `jsonschema_rs` and are only turned into lists when copied.
+    Other numpy types are left as they are, so that `jsonschema_rs` rejects them instead of accepting values which the
+    numpy-aware `jsonschema` validator would not.
+
+    :param instance: parameters or part of the parameters to convert
+    :returns: `instance`, or a converted copy of it
+    """
+    if isinstance(instance, dict):
+        converted = None
+        for key, value in instance.items():
+            converted_value = _to_json_types(value)
+            if converted_value is not value:
+                if converted is None:
+                    converted = dict(instance)
+                converted[key] = converted_value
+        return instance if converted is None else converted
+    if isinstance(instance, (list, tuple)):
+        converted = None
+        for i, item in enumerate(instance):
+            converted_item = _to_json_types(item)
+            if converted_item is not item:
+                if converted is None:
+                    converted = list(instance)
+                converted[i] = converted_item
+        return instance if converted is None else converted
+    if isinstance(instance, np.ndarray) and instance.dtype.kind in 'iuf':
+        return instance.tolist()
+    if isinstance(instance, (np.integer, np.floating)):
+        return instance.item()
+    return instance
 
 
 def validate_parameters(schema, parameters):
     """Validate OpenMX input parameters using jsonschema.
 
     The jsonschema Validator is retrieved for the appropriate schema version, and its TypeChecker
-    is extended to support Numpy int, float, complex, and array types.
+    is extended to support Numpy int, float, complex, and array types. The validator is built once
+    per schema object and reused for subsequent calls.
+
+    If `jsonschema_rs` is installed, the parameters are validated with its (much faster) validator instead, and its
+    errors are raised as `jsonschema.ValidationError`. The `jsonschema` validator is then only used if the parameters
+    contain types which `jsonschema_rs` does not support.
 
     :param schema: contents of the JSON schema file
     :param parameters: OpenMX input parameters
     :returns: None if validation is successful
+    :raises jsonschema.ValidationError: if the parameters are not valid
     """
+    if jsonschema_rs is not None:
+        try:
+            return _get_rs_validator(schema).validate(_to_json_types(parameters))
+        except jsonschema_rs.ValidationError as exception:
+            raise jsonschema.ValidationError(
+                exception.message, path=exception.instance_path, schema_path=exception.schema_path
+            ) from None
+        except ValueError:
+            # Raised by `jsonschema_rs` for Python types which cannot be represented in JSON
+            pass
     validator = _get_validator(schema)
     return validator.validate(parameters)
 
 
-def _get_xc_type(pseudos):
-    """Get the `SCF_XCTYPE` parameter from a set of pseudos."""
-    xc_set = {pseudo.xc_type for pseudo in pseudos.values()}
+def _get_node_property(nodes, name):
+    """Get a property of each node in a mapping, caching the values of stored nodes by UUID.
+
+    :param nodes: mapping of kind names onto `VpsData` or `PaoData` nodes
+    :param name: name of the property, e.g. `xc_type` or `z_valence`
+    :returns: dictionary of kind name -> property value
+    """
+    values = {}
+    for kind_name, node in nodes.items():
+        key = (node.uuid, name)
+        if key in _NODE_PROPERTY_CACHE:
+            _NODE_PROPERTY_CACHE.move_to_end(key)
+            values[kind_name] = _NODE_PROPERTY_CACHE[key]
+        else:
+            values[kind_name] = getattr(node, name)
+            if node.is_stored:
+                _NODE_PROPERTY_CACHE[key] = values[kind_name]
+                if len(_NODE_PROPERTY_CACHE) > _NODE_PROPERTY_CACHE_SIZE:
+                    _NODE_PROPERTY_CACHE.popitem(last=False)
+    return values
+
+
+def _get_xc_type(xc_types):
+    """Get the `SCF_XCTYPE` parameter from the exchange-correlation types of a set of pseudos."""
+    xc_set = set(xc_types.values())
     if len(xc_set) != 1:
         msg = 'The provided pseudos have inconsistent exchange-correlation type.'
         raise ValueError(msg)
     return xc_set.pop()
 
 
-def _get_def_atomic_species(structure, pseudos, orbitals, orbital_configurations):
+def _get_def_atomic_species(kinds, pseudos, orbitals, orbital_configurations):
     """Construct the `DEFINITION.OF.ATOMIC.SPECIES` parameter dictionary."""
     def_atomic_species = {}
-    for kind in structure.kinds:
+    for kind in kinds:
         def_atomic_species[kind.name] = {
             'pao': {
                 'file_stem': splitext(orbitals[kind.name].filename)[0],
@@ -114,12 +223,12 @@ def _get_def_atomic_species(structure, pseudos, orbitals, orbital_configurations
     return def_atomic_species
 
 
-def _get_atoms_spec_and_coords(structure, orbitals):
+def _get_atoms_spec_and_coords(sites, z_valences):
     """Construct the `ATOMS.SPECIESANDCOORDINATES` parameter dictionary."""
     atoms_spec_and_coords = []
-    for site in structure.sites:
+    for site in sites:
         kind_name = site.kind_name
-        valence = orbitals[kind_name].z_valence
+        valence = z_valences[kind_name]
         atoms_spec_and_coords.append({
             'specie': kind_name,
             'coords': site.position,
@@ -134,16 +243,22 @@ def _tag_block(block, tag):
     return f'<{tag}\n' + block + f'\n{tag}>\n'
 
 
+def _format_orbital_configuration(orbital_configuration):
+    """Format an orbital configuration as e.g. `s2p2d1`, skipping the angular momenta with no orbitals."""
+    return ''.join([
+        orb_letter + str(n_orb) for orb_letter, n_orb in zip(_ORBITAL_LETTERS, orbital_configuration) if n_orb != 0
+    ])
+
+
 def _write_def_atomic_species(def_atomic_species):
     """Write the `DEFINITION_OF_ATOMIC_SPECIES` input block."""
-    ORB_MAP = {0: 's', 1: 'p', 2: 'd', 3: 'f'}
     TAG = 'DEFINITION.OF.ATOMIC.SPECIES'
-    lines = []
-    for specie, data in def_atomic_species.items():
-        orbital_config = ''.join([
-            f'{ORB_MAP[i]}{n_orb}' for i, n_orb in enumerate(data['pao']['orbital_configuration']) if n_orb != 0
-        ])
-        lines.append(f'{specie} {data["pao"]["file_stem"]}-{orbital_config} {data["pseudo"]}')
+    lines = [
+        _DEF_ATOMIC_SPECIES_ROW_FORMAT(
+            specie, data['pao']['file_stem'], _format_orbital_configuration(data['pao']['orbital_configuration']),
+            data['pseudo']
+        ) for specie, data in def_atomic_species.items()
+    ]
     block = _tag_block('\n'.join(lines), TAG)
     return block
 
@@ -151,15 +266,13 @@ def _write_def_atomic_species(def_atomic_species):
 def _write_atoms_spec_and_coords(atoms_spec_and_coords):
     """Write the `ATOMS.SPECIESANDCOORDINATES` input block."""
     TAG = 'ATOMS.SPECIESANDCOORDINATES'
-    lines = []
-    for i, data in enumerate(atoms_spec_and_coords):
-        index = i + 1
-        kind_name = data['specie']
-        x, y, z = data['coords']
-        up_charge = data['up_charge']
-        down_charge = data['down_charge']
-        lines.append(f'{index:d} {kind_name} {x:0.12f} {y:0.12f} {z:0.12f} {up_charge:0.6f} {down_charge:0.6f}')
-    block = _tag_block('\n'.join(lines), TAG)
+    table = np.empty((len(atoms_spec_and_coords), len(_ATOMS_SPEC_AND_COORDS_FORMAT)), dtype=object)
+    table[:, 0] = np.arange(1, len(atoms_spec_and_coords) + 1)
+    table[:, 1] = [data['specie'] for data in atoms_spec_and_coords]
+    table[:, 2:5] = np.array([data['coords'] for data in atoms_spec_and_coords], dtype=np.float64).reshape(-1, 3)
+    table[:, 5] = [data['up_charge'] for data in atoms_spec_and_coords]
+    table[:, 6] = [data['down_charge'] for data in atoms_spec_and_coords]
+    block = _tag_block(_format_table(table, _ATOMS_SPEC_AND_COORDS_FORMAT), TAG)
     return block
 
 
@@ -168,6 +281,18 @@ def _write_band_kpath():
     # TAG = 'BAND.KPATH'
 
 
+def _format_table(table, fmt):
+    """Format the rows of a 2D table as lines of space-separated values.
+
+    :param table: 2D array of values
+    :param fmt: printf-style format string, or list of format strings (one per column)
+    :returns: formatted rows joined by newlines
+    """
+    buffer = io.StringIO()
+    np.savetxt(buffer, table, fmt=fmt, delimiter=' ')
+    return buffer.getvalue()[:-1]
+
+
 def _write_array_block(array, item_type, tag):
     """Write an array input block.
 
@@ -175,11 +300,7 @@ def _write_array_block(array, item_type, tag):
     :param type: JSON schema type of the items of the array
     :returns: OpenMX-formatted array input block
     """
-    type_format = _FORMAT_TYPE_MAPPING[item_type]
-    lines = []
-    for row in array:
-        lines.append(' '.join([type_format.format(item) for item in row]))
-    block = _tag_block('\n'.join(lines), tag)
+    block = _tag_block(_format_table(np.asarray(array), _PRINTF_TYPE_MAPPING[item_type]), tag)
     return block
 
 
@@ -192,32 +313,56 @@ _BLOCK_PARAMETER_WRITERS = {
 }
 
 
-def write_input_file(parameters, schema):
-    """Write an OpenMX input file.
+def _write_1d_array(value, kw_str, item_format):
+    """Write a 1D array parameter on a single line."""
+    return ' '.join([kw_str] + [item_format.format(item) for item in value]) + '\n'
+
+
+def _write_boolean(value, kw_str):
+    """Write a boolean parameter as ON/OFF, which is what OpenMX expects."""
+    return f'{kw_str} on\n' if value else f'{kw_str} off\n'
+
+
+def _get_parameter_writers(schema):
+    """Create (or retrieve from cache) a mapping of each keyword in the schema onto the function which writes it.
+
+    The writers only depend on the schema, so dispatching on the parameter type and building the format strings is
+    done once per schema instead of once per parameter in every input file.
 
-    :param parameters: Input parameters
     :param schema: Input parameters schema
-    :returns: Input file content
+    :returns: dictionary of keyword -> function taking the parameter value and returning its input file content
     """
-    input_file_content = ''
-    for kw, value in parameters.items():
-        value_type = schema['properties'][kw]['type']
+    try:
+        return _WRITER_CACHE[id(schema)][1]
+    except KeyError:
+        pass
+    writers = {}
+    for kw, properties in schema['properties'].items():
+        value_type = properties['type']
         kw_str = kw.replace('_', '.')
         # 2D arrays and complex data
         if kw in _BLOCK_PARAMETER_WRITERS:
-            param_content = _BLOCK_PARAMETER_WRITERS[kw](value)
+            writers[kw] = _BLOCK_PARAMETER_WRITERS[kw]
         # 1D arrays
-        elif value_type == 'array':
-            item_type = schema['properties'][kw]['items']['type']
-            item_format = _FORMAT_TYPE_MAPPING[item_type]
-            param_content = ' '.join([kw_str] + [item_format.format(item) for item in value]) + '\n'
+        elif value_type == 'array' and properties['items']['type'] in _FORMAT_TYPE_MAPPING:
+            item_format = _FORMAT_TYPE_MAPPING[properties['items']['type']]
+            writers[kw] = functools.partial(_write_1d_array, kw_str=kw_str, item_format=item_format)
         # Booleans must be -> ON/OFF for OpenMX
         elif value_type == 'boolean':
-            param_content = ' '.join([kw_str, 'on' if value else 'off']) + '\n'
+            writers[kw] = functools.partial(_write_boolean, kw_str=kw_str)
         # Scalar values
-        else:
-            value_format = _FORMAT_TYPE_MAPPING[value_type]
-            param_content = ' '.join([kw_str, value_format.format(value)]) + '\n'
-        input_file_content += param_content
+        elif value_type in _FORMAT_TYPE_MAPPING:
+            writers[kw] = f'{kw_str} {_FORMAT_TYPE_MAPPING[value_type]}\n'.format
+    _WRITER_CACHE[id(schema)] = (schema, writers)
+    return writers
+
+
+def write_input_file(parameters, schema):
+    """Write an OpenMX input file.
 
-    return input_file_content
+    :param parameters: Input parameters
+    :param schema: Input parameters schema
+    :returns: Input file content
+    """
+    writers = _get_parameter_writers(schema)
+    return ''.join([writers[kw](value) for kw, value in parameters.items()])
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """`CalcJob` for OpenMX `openmx`."""
 
-import copy
+import collections
+import functools
 import json
 import os
 
@@ -14,12 +15,27 @@ from aiida_basis.data.basis import PaoData
 
 from aiida_openmx.utils.dict import uppercase_dict_keys, lowercase_dict_values
 from aiida_openmx.calculations.helpers.openmx import (
-    _RESERVED_KEYWORDS, _get_atoms_spec_and_coords, _get_def_atomic_species, _get_xc_type, write_input_file,
-    validate_parameters
+    _RESERVED_KEYWORDS, _get_atoms_spec_and_coords, _get_def_atomic_species, _get_node_property, _get_xc_type,
+    write_input_file, validate_parameters
 )
 
 _DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Least-recently-used cache of the generated input parameters and input file content, keyed by the input nodes
+_INPUT_FILE_CACHE = collections.OrderedDict()
+_INPUT_FILE_CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=None)
+def _load_input_schema(filepath):
+    """Load the JSON input schema at `filepath`, caching the result for subsequent calls.
+
+    :param filepath: absolute path of the JSON schema file
+    :returns: contents of the JSON schema file
+    """
+    with open(filepath, 'r') as stream:
+        return json.load(stream)
+
 
 class OpenmxCalculation(CalcJob):
     """`CalcJob` for OpenMX `openmx`."""
@@ -181,39 +197,35 @@ class OpenmxCalculation(CalcJob):
         else:
             settings = {}
 
-        # Get an uppercase-key-only verion of the parameters dictionary (also check for case-insensitive duplicates)
-        parameters = uppercase_dict_keys(self.inputs.parameters.get_dict(), dict_name='parameters')
-
-        # No reserved parameter keywords should be provided
-        self._check_reserved_keywords(parameters)
-
-        # Load parameter schema
-        with open(self._INPUT_SCHEMA, 'r') as stream:
-            schema = json.load(stream)
-
-        # Automatically generate input parameters for derived fields, e.g. structure -> Atoms.Unitvectors, etc.
-        parameters = self._generate_input_parameters(
-            self.inputs.structure, self.inputs.kpoints, parameters, self.inputs.pseudos, self.inputs.orbitals,
-            self.inputs.orbital_configurations
-        )
-
-        # Get a lowercase-value-only version of the parameters dictionary
-        parameters = lowercase_dict_values(parameters)
-
-        # Validate input parameters
-        self._validate_inputs(
-            self.inputs.structure, self.inputs.kpoints, parameters, self.inputs.pseudos, self.inputs.orbitals,
-            self.inputs.orbital_configurations, schema
-        )
-
-        # Get input file contents and lists of the pseudopotential and orbital files which need to be copied
-        input_file_content = write_input_file(parameters, schema)
-        local_copy_pseudo_list, local_copy_orbital_list = self._generate_local_copy_lists(
-            self.inputs.pseudos, self.inputs.orbitals
+        # Generate the input parameters and input file content, reusing those of a previous submission in this process
+        # which used the same stored input nodes
+        cache_key = self._get_input_file_cache_key()
+        if cache_key in _INPUT_FILE_CACHE:
+            _INPUT_FILE_CACHE.move_to_end(cache_key)
+            parameters, input_file_content = _INPUT_FILE_CACHE[cache_key]
+        else:
+            parameters, input_file_content = self._generate_input_file()
+            if cache_key is not None:
+                _INPUT_FILE_CACHE[cache_key] = (parameters, input_file_content)
+                if len(_INPUT_FILE_CACHE) > _INPUT_FILE_CACHE_SIZE:
+                    _INPUT_FILE_CACHE.popitem(last=False)
+
+        # Pseudopotential and orbital files which already exist in a shared directory on the remote computer are
+        # symlinked from there instead of being copied from the repository for every calculation
+        shared_namespaces = (
+            ('SHARED_PSEUDO_DIR', dict(self.inputs.pseudos), self._PSEUDO_SUBFOLDER),
+            ('SHARED_ORBITAL_DIR', dict(self.inputs.orbitals), self._ORBITAL_SUBFOLDER),
         )
-
-        local_copy_list += local_copy_pseudo_list
-        local_copy_list += local_copy_orbital_list
+        for setting_name, nodes, subfolder in shared_namespaces:
+            if setting_name in settings:
+                remote_dir = settings.pop(setting_name)
+                if not isinstance(remote_dir, str) or not os.path.isabs(remote_dir):
+                    raise exceptions.InputValidationError(
+                        f'The `{setting_name}` setting should be an absolute path, not {remote_dir!r}.'
+                    )
+                remote_symlink_list += self._generate_remote_symlink_list(nodes, remote_dir, subfolder)
+            else:
+                local_copy_list += self._generate_local_copy_list(nodes, subfolder)
 
         # Add output files to retrieve which have been specified to write in the input parameters
         retrieve_list = []
@@ -231,7 +243,7 @@ class OpenmxCalculation(CalcJob):
         codeinfo = datastructures.CodeInfo()
         codeinfo.code_uuid = self.inputs.code.uuid
         codeinfo.withmpi = True
-        codeinfo.cmdline_params = ([self._INPUT_FILE] + list(settings.pop('CMDLINE', [])))
+        codeinfo.cmdline_params = [self._INPUT_FILE, *settings.pop('CMDLINE', ())]
         codeinfo.stdout_name = self._OUTPUT_FILE
 
         # Fill out the `CalcInfo`
@@ -241,110 +253,210 @@ class OpenmxCalculation(CalcJob):
         calcinfo.local_copy_list = local_copy_list
         calcinfo.remote_copy_list = remote_copy_list
         calcinfo.remote_symlink_list = remote_symlink_list
-        calcinfo.retrieve_list = retrieve_list
-        calcinfo.retrieve_list.append(self._OUTPUT_FILE)
-        calcinfo.retrieve_list += settings.pop('ADDITIONAL_RETRIEVE_LIST', [])
+        retrieve_list.append(self._OUTPUT_FILE)
+        retrieve_list.extend(settings.pop('ADDITIONAL_RETRIEVE_LIST', ()))
+        # Files requested more than once (e.g. the stdout file also listed in `ADDITIONAL_RETRIEVE_LIST`) are retrieved
+        # only once; nested (remote, local, depth) entries coming from a `Dict` are lists and are made hashable
+        calcinfo.retrieve_list = list(
+            dict.fromkeys(item if isinstance(item, str) else tuple(item) for item in retrieve_list)
+        )
 
         # TODO: pop parser settings and report remaining unknown settings
 
         return calcinfo
 
-    # pylint: disable=too-many-arguments
-    def _generate_input_parameters(self, structure, kpoints, parameters, pseudos, orbitals, orbital_configurations):
-        parameters = copy.deepcopy(parameters)
+    def _generate_input_file(self):
+        """Generate and validate the input parameters and write the content of the input file.
+
+        :returns: tuple of the input parameters dictionary and the input file content
+        """
+        # Get an uppercase-key-only verion of the parameters dictionary (also check for case-insensitive duplicates)
+        parameters = uppercase_dict_keys(self.inputs.parameters.get_dict(), dict_name='parameters')
+
+        # No reserved parameter keywords should be provided
+        self._check_reserved_keywords(parameters)
+
+        # Load parameter schema (only read from disk on the first submission)
+        schema = _load_input_schema(self._INPUT_SCHEMA)
 
-        parameters['SYSTEM_NAME'] = self._SYSTEM_NAME
-        parameters['DATA_PATH'] = self._DATA_PATH
+        # Materialize the kinds and sites of the structure and the pseudo and orbital namespaces only once, because
+        # `StructureData` rebuilds its `Kind` and `Site` objects from the node attributes on every access
+        kinds = self.inputs.structure.kinds
+        sites = self.inputs.structure.sites
+        pseudos = dict(self.inputs.pseudos)
+        orbitals = dict(self.inputs.orbitals)
+
+        # Read the pseudopotential and orbital properties needed for generation and validation only once
+        xc_types = _get_node_property(pseudos, 'xc_type')
+        pseudo_z_valences = _get_node_property(pseudos, 'z_valence')
+        orbital_z_valences = _get_node_property(orbitals, 'z_valence')
+
+        # KpointsData should have a kpoints_mesh; explicit k-points are not supported
+        try:
+            kpoints_mesh, kpoints_offset = self.inputs.kpoints.get_kpoints_mesh()
+        except AttributeError:
+            raise exceptions.InputValidationError(
+                'Explicit k-points are not supported. Instead, set a k-points mesh using '
+                'KpointsData.set_kpoints_mesh().'
+            )
+
+        # Automatically generate input parameters for derived fields, e.g. structure -> Atoms.Unitvectors, etc.
+        parameters = self._generate_input_parameters(
+            kinds, sites, self.inputs.structure.cell, kpoints_mesh, parameters, pseudos, orbitals, xc_types,
+            orbital_z_valences, self.inputs.orbital_configurations
+        )
+
+        # Get a lowercase-value-only version of the parameters dictionary
+        parameters = lowercase_dict_values(parameters)
+
+        # Validate input parameters
+        self._validate_inputs(
+            kinds, kpoints_offset, parameters, xc_types, pseudo_z_valences, orbital_z_valences,
+            self.inputs.orbital_configurations, schema
+        )
+
+        # Get input file contents
+        input_file_content = write_input_file(parameters, schema)
+
+        return parameters, input_file_content
+
+    def _get_input_file_cache_key(self):
+        """Return a key identifying the input nodes from which the input file is generated.
+
+        Stored nodes are immutable, so the same stored input nodes always produce the same input file.
+
+        :returns: hashable key, or None if any of the input nodes is not stored
+        """
+        inputs = self.inputs
+        nodes = [inputs.structure, inputs.kpoints, inputs.parameters, inputs.orbital_configurations]
+        nodes += list(inputs.pseudos.values()) + list(inputs.orbitals.values())
+        if not all(node.is_stored for node in nodes):
+            return None
+        return (
+            type(self), inputs.structure.uuid, inputs.kpoints.uuid,
+            inputs.parameters.uuid, inputs.orbital_configurations.uuid,
+            tuple(sorted((kind, node.uuid) for kind, node in inputs.pseudos.items())),
+            tuple(sorted((kind, node.uuid) for kind, node in inputs.orbitals.items()))
+        )
+
+    # pylint: disable=too-many-arguments
+    @classmethod
+    def _generate_input_parameters(
+        cls, kinds, sites, cell, kpoints_mesh, parameters, pseudos, orbitals, xc_types, orbital_z_valences,
+        orbital_configurations
+    ):
+        # Only top-level keys are (re)assigned below, so a shallow copy is enough to leave the caller's dict untouched
+        parameters = dict(parameters)
+
+        parameters['SYSTEM_NAME'] = cls._SYSTEM_NAME
+        parameters['DATA_PATH'] = cls._DATA_PATH
         parameters['LEVEL_OF_STDOUT'] = 3
         parameters['LEVEL_OF_FILEOUT'] = 0
-        parameters['SPECIES_NUMBER'] = len(structure.kinds)
+        parameters['SPECIES_NUMBER'] = len(kinds)
         parameters['DEFINITION_OF_ATOMIC_SPECIES'] = _get_def_atomic_species(
-            structure, pseudos, orbitals, orbital_configurations
+            kinds, pseudos, orbitals, orbital_configurations
         )
-        parameters['ATOMS_NUMBER'] = len(structure.sites)
-        parameters['ATOMS_SPECIESANDCOORDINATES'] = _get_atoms_spec_and_coords(structure, orbitals)
-        parameters['ATOMS_UNITVECTORS'] = structure.cell
-        parameters['SCF_XCTYPE'] = _get_xc_type(pseudos)
-        parameters['SCF_KGRID'] = kpoints.get_kpoints_mesh()[0]
+        parameters['ATOMS_NUMBER'] = len(sites)
+        parameters['ATOMS_SPECIESANDCOORDINATES'] = _get_atoms_spec_and_coords(sites, orbital_z_valences)
+        parameters['ATOMS_UNITVECTORS'] = cell
+        parameters['SCF_XCTYPE'] = _get_xc_type(xc_types)
+        parameters['SCF_KGRID'] = kpoints_mesh
 
         return parameters
 
-    def _check_reserved_keywords(self, parameters):
-        provided_reserved_kws = []
-        for kw in parameters:
-            if kw in _RESERVED_KEYWORDS:
-                provided_reserved_kws.append(kw)
+    @staticmethod
+    def _check_reserved_keywords(parameters):
+        provided_reserved_kws = _RESERVED_KEYWORDS.intersection(parameters)
         if provided_reserved_kws:
-            msg = f'The reserved keywords {", ".join(provided_reserved_kws)} were specified but should not be provided.'
+            msg = (
+                f'The reserved keywords {", ".join(sorted(provided_reserved_kws))} were specified but should not be '
+                'provided.'
+            )
             raise exceptions.InputValidationError(msg)
 
     # pylint: disable=too-many-arguments
-    def _validate_inputs(self, structure, kpoints, parameters, pseudos, orbitals, orbital_configurations, schema):
+    @staticmethod
+    def _validate_inputs(
+        kinds, kpoints_offset, parameters, xc_types, pseudo_z_valences, orbital_z_valences, orbital_configurations,
+        schema
+    ):
         # A pseudopotential should be specified for each kind present in the `StructureData`
-        kinds = [kind.name for kind in structure.kinds]
-        if set(kinds) != set(pseudos.keys()):
+        kinds_set = {kind.name for kind in kinds}
+        if kinds_set ^ xc_types.keys():
             raise exceptions.InputValidationError(
                 'Mismatch between the defined pseudos and the list of kinds of the structure.\n'
-                'Pseudos: {};\nKinds: {}'.format(', '.join(list(pseudos.keys())), ', '.join(list(kinds)))
+                'Kinds without pseudos: {};\nPseudos without kinds: {}'.format(
+                    ', '.join(sorted(kinds_set - xc_types.keys())), ', '.join(sorted(xc_types.keys() - kinds_set))
+                )
             )
 
         # All pseudopotentials should have the same exchange-correlation type
-        xc_set = {pseudo.xc_type for pseudo in pseudos.values()}
+        xc_set = set(xc_types.values())
         if len(xc_set) != 1:
             raise exceptions.InputValidationError(
                 f'The provided pseudos have inconsistent exchange-correlation types: {xc_set}.'
             )
 
         # An orbital basis should be specified for each kind present in the `StructureData`
-        if set(kinds) != set(orbitals.keys()):
+        if kinds_set ^ orbital_z_valences.keys():
             raise exceptions.InputValidationError(
                 'Mismatch between the defined orbitals and the list of kinds of the structure.\n'
-                'Orbitals: {};\nKinds: {}'.format(', '.join(list(orbitals.keys())), ', '.join(list(kinds)))
+                'Kinds without orbitals: {};\nOrbitals without kinds: {}'.format(
+                    ', '.join(sorted(kinds_set - orbital_z_valences.keys())),
+                    ', '.join(sorted(orbital_z_valences.keys() - kinds_set))
+                )
             )
 
         # Corresponding orbital bases and pseudopotentials should have the same Z-valence
         inconsistent_z_valence = {}
-        for kind in set(kinds):
-            if pseudos[kind].z_valence != orbitals[kind].z_valence:
-                inconsistent_z_valence[kind] = (pseudos[kind].z_valence, orbitals[kind].z_valence)
+        for kind in kinds_set:
+            if pseudo_z_valences[kind] != orbital_z_valences[kind]:
+                inconsistent_z_valence[kind] = (pseudo_z_valences[kind], orbital_z_valences[kind])
         if inconsistent_z_valence:
             raise exceptions.InputValidationError(
                 f'Mismatch between the pseudopotential and orbital valences: {inconsistent_z_valence}.'
             )
 
         # An orbital configuration should be specified for each orbital basis
-        if set(orbital_configurations.get_arraynames()) != set(orbitals.keys()):
+        if set(orbital_configurations.get_arraynames()) != orbital_z_valences.keys():
             raise exceptions.InputValidationError(
                 'Mismatch between the defined orbitals and the array names of the orbital configurations.\n'
                 'Orbitals: {};\nOrbital configurations: {}'.format(
-                    ','.join(list(orbitals.keys())), ', '.join(orbital_configurations.get_arraynames())
+                    ', '.join(orbital_z_valences), ', '.join(orbital_configurations.get_arraynames())
                 )
             )
 
-        # KpointsData should have a kpoints_mesh; explicit k-points are not supported
-        try:
-            kpoints.get_kpoints_mesh()
-        except AttributeError:
-            raise exceptions.InputValidationError(
-                'Explicit k-points are not supported. Instead, set a k-points mesh using '
-                'KpointsData.set_kpoints_mesh().'
-            )
-
         # KpointsData should have a 0-shift; shifts are not supported
-        try:
-            shift = kpoints.get_kpoints_mesh()[1]
-            if any([shift_i != 0 for shift_i in shift]):
-                raise exceptions.InputValidationError('k-points shifts are not supported.')
-        except AttributeError:
-            pass
+        if any(shift_i != 0 for shift_i in kpoints_offset):
+            raise exceptions.InputValidationError('k-points shifts are not supported.')
 
         # Validate against the JSON schema
         validate_parameters(schema, parameters)
 
-    def _generate_local_copy_lists(self, pseudos, orbitals):
-        pseudo_file_list = [(pseudo.uuid, pseudo.filename, os.path.join(self._PSEUDO_SUBFOLDER, pseudo.filename))
-                            for pseudo in pseudos.values()]
-        orbital_file_list = [(orbital.uuid, orbital.filename, os.path.join(self._ORBITAL_SUBFOLDER, orbital.filename))
-                             for orbital in orbitals.values()]
+    @staticmethod
+    def _generate_local_copy_list(nodes, subfolder):
+        """Generate the local copy list of the files of the `VpsData` or `PaoData` nodes of an input namespace.
+
+        Kinds which share a node (e.g. spin-split kinds of the same element) need the file to be copied only once;
+        `dict.fromkeys` drops the duplicate entries while preserving their order.
 
-        return pseudo_file_list, orbital_file_list
+        :param nodes: mapping of kind names onto `VpsData` or `PaoData` nodes
+        :param subfolder: subfolder of the working directory into which to copy the files, ending with a separator
+        :returns: list of `(node_uuid, filename, destination_path)` tuples
+        """
+        return list(dict.fromkeys((node.uuid, node.filename, subfolder + node.filename) for node in nodes.values()))
+
+    def _generate_remote_symlink_list(self, nodes, remote_dir, subfolder):
+        """Generate the remote symlink list for files already present in `remote_dir` on the remote computer.
+
+        Nodes shared by several kinds are symlinked only once.
+
+        :param nodes: mapping of kind names onto `VpsData` or `PaoData` nodes
+        :param remote_dir: absolute path of the directory on the remote computer containing the files
+        :param subfolder: subfolder of the working directory in which to create the symlinks, ending with a separator
+        :returns: list of `(computer_uuid, remote_path, destination_path)` tuples
+        """
+        computer_uuid = self.node.computer.uuid
+        remote_dir = remote_dir.rstrip('/') + '/'
+        filenames = dict.fromkeys(node.filename for node in nodes.values())
+        return [(computer_uuid, remote_dir + filename, subfolder + filename) for filename in filenames]
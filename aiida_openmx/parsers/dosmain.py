@@ -36,19 +36,22 @@ class DosmainParser(Parser):
         else:
             filename = 'aiida.DOS.Gaussian'
 
-        if filename not in self.retrieved.list_object_names():
-            return self.exit_codes.ERROR_DOS_OUTPUT_MISSING
-
         try:
             with self.retrieved.open(filename, 'r') as stream:
-                dos = np.loadtxt(stream)
+                dos = np.loadtxt(stream, ndmin=2)
         except FileNotFoundError:
-            return self.exit_codes.ERROR_DOS_OUTPUT_MISSING
+            return self.exit_codes.ERROR_OUTPUT_DOS_MISSING
         except OSError:
-            return self.exit_codes.ERROR_DOS_OUTPUT_READ
+            return self.exit_codes.ERROR_OUTPUT_DOS_READ
+        except ValueError:
+            return self.exit_codes.ERROR_OUTPUT_DOS_PARSE
+
+        if dos.size == 0:
+            return self.exit_codes.ERROR_OUTPUT_DOS_PARSE
 
         dos_ad = ArrayData()
-        dos_ad.set_array('dos', dos)
+        dos_ad.set_array('energies', np.ascontiguousarray(dos[:, 0]))
+        dos_ad.set_array('dos', np.ascontiguousarray(dos[:, 1:]))
         self.out('output_dos', dos_ad)
 
         return ExitCode(0)
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """OpenMX `openmx` output parser."""
 
+import numpy as np
+
 from aiida.common import exceptions
 from aiida.engine import ExitCode
 from aiida.orm import Dict, StructureData
@@ -20,6 +22,10 @@ STRESS_UNITS = 'GPa'
 COMPUTATIONAL_TIME_UNITS = 's'
 SIMULATION_TIME_UNITS = 'fs'
 
+# Unit conversion factors, bound once instead of looked up on the `units` module for every parsed value
+HA_TO_EV = units.Ha_to_eV
+HA_BOHR_TO_EV_ANG = units.Ha_to_eV / units.bohr_to_ang
+
 ENERGY_NAME_MAPPING = {
     'Uele.': 'u_band',
     'Ukin.': 'u_kinetic',
@@ -77,6 +83,76 @@ MD_TYPES_MD = []
 MD_TYPES_OPT = []
 
 
+def _get_last_line(content, anchor):
+    """Return the last line of `content` which contains `anchor`.
+
+    :param content: text content of an output file
+    :param anchor: substring identifying the line
+    :returns: the line without its newline character, or None if `anchor` does not occur in `content`
+    """
+    anchor_pos = content.rfind(anchor)
+    if anchor_pos == -1:
+        return None
+    line_start = content.rfind('\n', 0, anchor_pos) + 1
+    line_stop = content.find('\n', anchor_pos)
+    if line_stop == -1:
+        line_stop = len(content)
+    return content[line_start:line_stop]
+
+
+def _get_last_block(content, anchor, offset, sentinel=None):
+    """Return the lines of the last block of `content` introduced by a line which contains `anchor`.
+
+    The block starts `offset` lines after the header line and stops before the first following line which contains
+    `sentinel`, or at the end of `content`. Both ends are found with `str.find`, without iterating over the lines.
+
+    :param content: text content of an output file
+    :param anchor: substring identifying the header line of the block
+    :param offset: number of lines from the header line to the first line of the block
+    :param sentinel: substring identifying the line which terminates the block
+    :returns: list of the lines of the block, or None if `anchor` does not occur in `content`
+    """
+    anchor_pos = content.rfind(anchor)
+    if anchor_pos == -1:
+        return None
+    block_start = content.rfind('\n', 0, anchor_pos) + 1
+    for _ in range(offset):
+        block_start = content.find('\n', block_start) + 1
+        if block_start == 0:
+            return []
+    block_stop = len(content) if sentinel is None else content.find(sentinel, block_start)
+    if block_stop == -1:
+        block_stop = len(content)
+    else:
+        block_stop = max(content.rfind('\n', 0, block_stop) + 1, block_start)
+    return content[block_start:block_stop].splitlines()
+
+
+def _parse_table(lines, num_columns):
+    """Parse lines of whitespace-separated numbers into a 2D array in a single conversion.
+
+    :param lines: lines of the table
+    :param num_columns: number of values on each line
+    :returns: array of shape `(len(lines), num_columns)`
+    :raises ValueError: if a value is not a number or the lines do not all hold `num_columns` values
+    """
+    return np.array(' '.join(lines).split(), dtype=np.float64).reshape(-1, num_columns)
+
+
+def _parse_words_table(lines, num_columns):
+    """Split lines of whitespace-separated words into a 2D array of strings in a single pass.
+
+    Columns holding numbers can then be converted at once with `astype`, e.g. for tables which mix atomic species and
+    coordinates.
+
+    :param lines: lines of the table
+    :param num_columns: number of words on each line
+    :returns: string array of shape `(len(lines), num_columns)`
+    :raises ValueError: if the lines do not all hold `num_columns` words
+    """
+    return np.array(' '.join(lines).split()).reshape(-1, num_columns)
+
+
 class OpenmxParser(Parser):
     """Basic parser for OpenMX outputs."""
 
@@ -93,7 +169,6 @@ class OpenmxParser(Parser):
 
         return exit_code
 
-    # TODO: parse Mulliken populations, dipole moments, forces
     def _parse_stdout(self, md_type):
         # pylint: disable=too-many-locals,too-many-branches,too-many-statements,too-many-nested-blocks
         """Parse OpenMX stdout.
@@ -115,254 +190,196 @@ class OpenmxParser(Parser):
         """
         filename = self.node.process_class.output_filename
 
-        if filename not in self.retrieved.list_object_names():
-            return self.exit_codes.ERROR_OUTPUT_STDOUT_MISSING
-
         try:
             with self.retrieved.open(filename, 'r') as stream:
-                lines = stream.readlines()
+                content = stream.read()
         except FileNotFoundError:
             return self.exit_codes.ERROR_OUTPUT_STDOUT_MISSING
         except OSError:
             return self.exit_codes.ERROR_OUTPUT_STDOUT_READ
 
         parameters = {}
-        # printed multiple times (at each MD step)
-        energies = {value: [] for value in ENERGY_NAME_MAPPING.values()}  # [Ha] -> eV
-
-        for line_i, line in enumerate(lines):
-            if 'OpenMX Ver.' in line:
-                parameters['openmx_version'] = line.strip().split()[7]
-
-            if 'MPI processes' in line:
-                parameters['mpi_procs'] = int(line.strip().split()[1])
-
-            if 'OpenMP threads' in line:
-                parameters['omp_threads'] = int(line.strip().split()[5])
-
-            if 'Used cutoff energy (Ryd) for 3D-grids' in line:
-                cutoff_a, cutoff_b, cutoff_c = line.strip().split('=')[1].strip().split(',')  # [Ry]
-                parameters['true_scf_ecut'] = [
-                    float(cutoff_a) * units.Ha_to_eV / 2,
-                    float(cutoff_b) * units.Ha_to_eV / 2,
-                    float(cutoff_c) * units.Ha_to_eV / 2
-                ]
-                parameters['true_scf_ecut' + UNITS_SUFFIX] = ENERGY_UNITS
-
-            if 'Num. of grids of a-, b-, and c-axes' in line:
-                grid_a, grid_b, grid_c = line.strip().split('=')[1].strip().split(',')
-                parameters['3d_fft_grid'] = [int(grid_a), int(grid_b), int(grid_c)]
-
-            ## contains total energy and its components
-            if 'Total energy (Hartree) at MD' in line:
-                energies_start = line_i + 3
-
-                energies_stop = energies_start
-                while 'Note:' not in lines[energies_stop]:
-                    energies_stop += 1
-
-                for energy_line in lines[energies_start:energies_stop]:
-                    for energy_openmx_name, energy_aiida_name in ENERGY_NAME_MAPPING.items():
-                        if energy_openmx_name in energy_line:
-                            energy_tmp = float(energy_line.strip().split()[1]) * units.Ha_to_eV
-                            energies[energy_aiida_name].append(energy_tmp)
-
-            if 'Eigenvalues (Hartree) of SCF KS-eq.' in line:
-                bands = {
-                    'e_fermi': [],  # [Ha] -> [eV]
-                    'n_states': [],
-                    'k_points': [],  # reciprocal coords [frac]
-                    'up': [],  # spin-up eigenvalues [Ha] -> [eV]
-                    'down': []  # spin-down eigenvalues [Ha] -> [eV]
-                }
-                ## eigenvalues block
-                # set to start of block
-                eigvals_start = line_i + 4
-                # find line index for end of block
-                eigvals_stop = eigvals_start
-                while '*' not in lines[eigvals_stop]:
-                    eigvals_stop += 1
-                # set to end of block
-                eigvals_stop -= 1
-                eigvals_lines = lines[eigvals_start:eigvals_stop]
-
-                ## header info
-                # chemical potential (AZ: I'm assuming this is the Fermi energy)
-                e_F_tmp = float(eigvals_lines[0].split('=')[1].strip())  # "Chemical Potential ..." [Ha]
-                bands['e_fermi'].append(e_F_tmp * units.Ha_to_eV)  # [eV]
-                n_states_tmp = float(eigvals_lines[1].split('=')[1].strip())  # "Number of States ..."
-                bands['n_states'].append(n_states_tmp)
-
-                ## k-points blocks
-                # get the line index (in eigvals_lines) for the start of each "kloop" block
-                kloop_starts = []
-                for line_j, eigvals_line in enumerate(eigvals_lines):
-                    if 'kloop' in eigvals_line:  # "kloop=`kloop_i`"
-                        kloop_starts.append(line_j)
-                kloop_stops = kloop_starts[1:] + [len(eigvals_lines)]
-
-                # spin-up and spin-down eigenvalues for each "kloop" block
-                for kloop_start, kloop_stop in zip(kloop_starts, kloop_stops):
-                    # a block is [start_indices[i] -> start_indices[i + 1]) long
-                    kloop_lines = eigvals_lines[kloop_start:kloop_stop]
-                    # the second line of the block gives the k-point
-                    k_words = kloop_lines[1].strip().split()  # ["k1=", k1, "k2=", k2, "k3=", k3]
-                    bands['k_points'].append([float(k_words[1]), float(k_words[3]), float(k_words[5])])
-
-                    # the fourth to second-to-last lines hold the eigenvalues
-                    eigvals_up_tmp = []
-                    eigvals_down_tmp = []
-                    for kloop_line in kloop_lines[3:-2]:
-                        _, e_up, e_down = kloop_line.strip().split()  # [band index], [Ha], [Ha]
-                        eigvals_up_tmp.append(float(e_up) * units.Ha_to_eV)
-                        eigvals_down_tmp.append(float(e_down) * units.Ha_to_eV)
-                    bands['up'].append(eigvals_up_tmp)
-                    bands['down'].append(eigvals_down_tmp)
-
-            if 'History of cell optimization' in line:
-                cell_opt = {
-                    'sd_scaling': [],
-                    'abs_max_force': [],  # [Ha/Bohr] -> [eV/Å]
-                    'max_step': [],
-                    'u_tot': [],  # [Ha] -> [eV]
-                    'enthalpy': [],  # [Ha] -> [eV]
-                    'vol': []  # [Å^3]
-                }
-                cell_opt_start = line_i + 7
-                cell_opt_stop = cell_opt_start
-                while '*' not in lines[cell_opt_stop]:
-                    cell_opt_stop += 1
-
-                cell_opt_lines = lines[cell_opt_start:cell_opt_stop - 1]
-                for cell_opt_line in cell_opt_lines:
-                    _, sd_scaling, abs_max_force, max_step, u_tot, enthalpy, vol = cell_opt_line.strip().split()
-                    cell_opt['sd_scaling'].append(float(sd_scaling))
-                    cell_opt['abs_max_force'].append(
-                        float(abs_max_force) * units.Ha_to_eV / units.bohr_to_ang
-                    )  # [eV/Å]
-                    cell_opt['max_step'].append(float(max_step))  # [Å]
-                    cell_opt['u_tot'].append(float(u_tot) * units.Ha_to_eV)  # [eV]
-                    cell_opt['enthalpy'].append(float(enthalpy) * units.Ha_to_eV)  # [eV]
-                    cell_opt['vol'].append(float(vol))  # [Å^3]
-
-            if 'Mulliken populations' in line:
-                pass
-
-            if 'Dipole moment (Debye)' in line:
-                dipole_start = line_i + 4
-                dipole_stop = dipole_start
-                while '*' not in lines[dipole_stop]:
-                    dipole_stop += 1
-
-                for dipole_line in lines[dipole_start:dipole_stop]:
-                    if 'Absolute D' in dipole_line:
-                        parameters['abs_dipole_mom'] = float(dipole_line.strip().split()[2])  # [Debye]
-                        parameters['abs_dipole_mom' + UNITS_SUFFIX] = DIPOLE_UNITS
-                    else:
-                        for openmx_dipole_name, aiida_dipole_name in DIPOLE_NAME_MAPPING.items():
-                            if openmx_dipole_name in dipole_line:
-                                dx, dy, dz = dipole_line.replace(openmx_dipole_name, '').strip().split()
-                                parameters[aiida_dipole_name] = [float(dx), float(dy), float(dz)]  # [Debye]
-                                parameters[aiida_dipole_name + UNITS_SUFFIX] = DIPOLE_UNITS
-
-            if 'Cell vectors (Ang.) and derivatives of total energy' in line:
-                final_cell_vectors = []
-                final_de_dcell = []
-
-                cell_start = line_i + 4
-                cell_stop = cell_start
-                while '*' not in lines[cell_stop]:
-                    cell_stop += 1
-
-                cell_lines = lines[cell_start:cell_stop]
-                for cell_line in cell_lines:
-                    if 'a' in cell_line:
-                        cell_text, de_dcell_text = cell_line.strip().split('=')[1:]
-                        x, y, z = cell_text.strip().split()[:-1]
-                        de_dx, de_dy, de_dz = de_dcell_text.strip().split()
-
-                        final_cell_vectors.append([float(x), float(y), float(z)])  # [Å]
-                        final_de_dcell.append([
-                            float(de_dx) * units.Ha_to_eV / units.bohr_to_ang,
-                            float(de_dy) * units.Ha_to_eV / units.bohr_to_ang,
-                            float(de_dz) * units.Ha_to_eV / units.bohr_to_ang
-                        ])
-
-                parameters['final_de_dcell'] = final_de_dcell
-                parameters['final_de_dcell' + UNITS_SUFFIX] = FORCE_UNITS
-
-            if 'xyz-coordinates (Ang.) and forces (Hartree/Bohr)' in line:
-                final_cart_coords = {
-                    'species': [],
-                    'coords': []  # [Å]
-                }
-                final_forces = []  # [eV/Å]
-
-                final_cart_coords_start = line_i + 6
-                final_cart_coords_stop = final_cart_coords_start
-                while 'coordinates.forces' not in lines[final_cart_coords_stop]:
-                    final_cart_coords_stop += 1
-
-                for final_cart_coords_line in lines[final_cart_coords_start:final_cart_coords_stop]:
-                    specie, x, y, z, fx, fy, fz = final_cart_coords_line.strip().split()[1:]
-                    final_cart_coords['species'].append(specie)
-                    final_cart_coords['coords'].append([float(x), float(y), float(z)])
-                    final_forces.append([
-                        float(fx) * units.Ha_to_eV / units.bohr_to_ang,
-                        float(fy) * units.Ha_to_eV / units.bohr_to_ang,
-                        float(fz) * units.Ha_to_eV / units.bohr_to_ang
-                    ])
-
-                parameters['final_forces'] = final_forces
-                parameters['final_forces' + UNITS_SUFFIX] = FORCE_UNITS
-
-            if 'Fractional coordinates of the final structure' in line:
-                final_frac_coords = {
-                    'species': [],
-                    'coords': []  # [frac]
-                }
-                # set to start of block
-                final_frac_coords_start = line_i + 4
-
-                # find line index for end of block
-                final_frac_coords_stop = final_frac_coords_start
-                while '*' not in lines[final_frac_coords_stop]:
-                    final_frac_coords_stop += 1
-
-                for final_frac_coords_line in lines[final_frac_coords_start:final_frac_coords_stop - 1]:
-                    specie, x, y, z = final_frac_coords_line.strip().split()[1:]  # [species], [frac], [frac], [frac]
-                    final_frac_coords['species'].append(specie)
-                    final_frac_coords['coords'].append([float(x), float(y), float(z)])
-
-            if 'Computational Time (second)' in line:
-                timing = {}  # [s]
-
-                # set to start of block
-                timing_start_i = line_i + 4
-                # written at the end of the file
-                timing_stop_i = len(lines)
-
-                timing['elapsed_time'] = float(lines[timing_start_i].strip().split()[1])
-                timing['elapsed_time' + UNITS_SUFFIX] = COMPUTATIONAL_TIME_UNITS
-
-                for timing_line in lines[timing_start_i + 1:timing_stop_i]:
-                    for key, value in TIMING_NAME_MAPPING.items():
-                        if key in line:
-                            min_id, min_time, max_id, max_time = timing_line.strip().split('=')[1].strip().split()
-                            timing_tmp = {
-                                'min_id': int(min_id),
-                                'min_time': float(min_time),
-                                'max_id': int(max_id),
-                                'max_time': float(max_time)
-                            }
-                            timing[value] = timing_tmp
-                            timing[value + UNITS_SUFFIX] = COMPUTATIONAL_TIME_UNITS
-
-                parameters = {**parameters, **timing}
+        # printed multiple times (at each MD step), only the values of the last step are kept
+        energies = {}  # [Ha] -> eV
+
+        # Blocks printed more than once (e.g. at each MD step) are overwritten by their later occurrences, so each
+        # block is looked up directly by the last occurrence of its header instead of testing every line of the file
+        line = _get_last_line(content, 'OpenMX Ver.')
+        if line is not None:
+            parameters['openmx_version'] = line.strip().split()[7]
+
+        line = _get_last_line(content, 'MPI processes')
+        if line is not None:
+            parameters['mpi_procs'] = int(line.strip().split()[1])
+
+        line = _get_last_line(content, 'OpenMP threads')
+        if line is not None:
+            parameters['omp_threads'] = int(line.strip().split()[5])
+
+        line = _get_last_line(content, 'Used cutoff energy (Ryd) for 3D-grids')
+        if line is not None:
+            cutoff_a, cutoff_b, cutoff_c = line.strip().split('=')[1].strip().split(',')  # [Ry]
+            parameters['true_scf_ecut'] = [
+                float(cutoff_a) * HA_TO_EV / 2,
+                float(cutoff_b) * HA_TO_EV / 2,
+                float(cutoff_c) * HA_TO_EV / 2
+            ]
+            parameters['true_scf_ecut' + UNITS_SUFFIX] = ENERGY_UNITS
+
+        line = _get_last_line(content, 'Num. of grids of a-, b-, and c-axes')
+        if line is not None:
+            grid_a, grid_b, grid_c = line.strip().split('=')[1].strip().split(',')
+            parameters['3d_fft_grid'] = [int(grid_a), int(grid_b), int(grid_c)]
+
+        ## contains total energy and its components
+        energies_lines = _get_last_block(content, 'Total energy (Hartree) at MD', 3, 'Note:')
+        if energies_lines is not None:
+            for energy_line in energies_lines:
+                # the energy name is the first word of the line, e.g. "Utot.   -7.927440303546"
+                energy_words = energy_line.split()
+                if energy_words and energy_words[0] in ENERGY_NAME_MAPPING:
+                    energies[ENERGY_NAME_MAPPING[energy_words[0]]] = float(energy_words[1]) * HA_TO_EV
+
+        ## eigenvalues block, which ends on the line before the next '*' line
+        eigvals_lines = _get_last_block(content, 'Eigenvalues (Hartree) of SCF KS-eq.', 4, '*')
+        if eigvals_lines is not None:
+            eigvals_lines = eigvals_lines[:-1]
+            bands = {
+                'e_fermi': [],  # [Ha] -> [eV]
+                'n_states': [],
+                'k_points': [],  # reciprocal coords [frac]
+                'up': [],  # spin-up eigenvalues [Ha] -> [eV]
+                'down': []  # spin-down eigenvalues [Ha] -> [eV]
+            }
+
+            ## header info
+            # chemical potential (AZ: I'm assuming this is the Fermi energy)
+            e_F_tmp = float(eigvals_lines[0].split('=')[1].strip())  # "Chemical Potential ..." [Ha]
+            bands['e_fermi'].append(e_F_tmp * HA_TO_EV)  # [eV]
+            n_states_tmp = float(eigvals_lines[1].split('=')[1].strip())  # "Number of States ..."
+            bands['n_states'].append(n_states_tmp)
+
+            ## k-points blocks
+            # get the line index (in eigvals_lines) for the start of each "kloop" block
+            kloop_starts = []
+            for line_j, eigvals_line in enumerate(eigvals_lines):
+                if 'kloop' in eigvals_line:  # "kloop=`kloop_i`"
+                    kloop_starts.append(line_j)
+            kloop_stops = kloop_starts[1:] + [len(eigvals_lines)]
+
+            # spin-up and spin-down eigenvalues for each "kloop" block
+            for kloop_start, kloop_stop in zip(kloop_starts, kloop_stops):
+                # a block is [start_indices[i] -> start_indices[i + 1]) long
+                kloop_lines = eigvals_lines[kloop_start:kloop_stop]
+                # the second line of the block gives the k-point
+                k_words = kloop_lines[1].strip().split()  # ["k1=", k1, "k2=", k2, "k3=", k3]
+                bands['k_points'].append([float(k_words[1]), float(k_words[3]), float(k_words[5])])
+
+                # the fourth to second-to-last lines hold the eigenvalues: [band index], [Ha], [Ha]
+                eigvals = _parse_table(kloop_lines[3:-2], 3)[:, 1:] * HA_TO_EV
+                bands['up'].append(eigvals[:, 0].tolist())
+                bands['down'].append(eigvals[:, 1].tolist())
+
+        cell_opt_lines = _get_last_block(content, 'History of cell optimization', 7, '*')
+        if cell_opt_lines is not None:
+            # [step], [-], [Ha/Bohr], [Å], [Ha], [Ha], [Å^3]
+            cell_opt_table = _parse_table(cell_opt_lines[:-1], 7)
+            cell_opt = {
+                'sd_scaling': cell_opt_table[:, 1].tolist(),
+                'abs_max_force': (cell_opt_table[:, 2] * HA_BOHR_TO_EV_ANG).tolist(),  # [eV/Å]
+                'max_step': cell_opt_table[:, 3].tolist(),  # [Å]
+                'u_tot': (cell_opt_table[:, 4] * HA_TO_EV).tolist(),  # [eV]
+                'enthalpy': (cell_opt_table[:, 5] * HA_TO_EV).tolist(),  # [eV]
+                'vol': cell_opt_table[:, 6].tolist()  # [Å^3]
+            }
+
+        # TODO: parse Mulliken populations
+
+        dipole_lines = _get_last_block(content, 'Dipole moment (Debye)', 4, '*')
+        if dipole_lines is not None:
+            for dipole_line in dipole_lines:
+                if 'Absolute D' in dipole_line:
+                    parameters['abs_dipole_mom'] = float(dipole_line.strip().split()[2])  # [Debye]
+                    parameters['abs_dipole_mom' + UNITS_SUFFIX] = DIPOLE_UNITS
+                else:
+                    # the dipole name (which can be two words, e.g. "Back ground") precedes the three components
+                    dipole_words = dipole_line.split()
+                    aiida_dipole_name = DIPOLE_NAME_MAPPING.get(' '.join(dipole_words[:-3]))
+                    if aiida_dipole_name is not None:
+                        dx, dy, dz = dipole_words[-3:]
+                        parameters[aiida_dipole_name] = [float(dx), float(dy), float(dz)]  # [Debye]
+                        parameters[aiida_dipole_name + UNITS_SUFFIX] = DIPOLE_UNITS
+
+        cell_lines = _get_last_block(content, 'Cell vectors (Ang.) and derivatives of total energy', 4, '*')
+        if cell_lines is not None:
+            # "a1 = [Å] [Å] [Å] DE/Da1 = [Ha/Bohr] [Ha/Bohr] [Ha/Bohr]"; the lines are split on '=' so that the
+            # spacing around it does not matter, and only the numbers of all the lines are converted at once
+            cell_numbers_lines = []
+            for cell_line in cell_lines:
+                if 'a' in cell_line:
+                    cell_text, de_dcell_text = cell_line.split('=')[1:]
+                    # drop the "DE/Da1" label which precedes the second '='
+                    cell_numbers_lines.append(cell_text.rsplit(None, 1)[0] + ' ' + de_dcell_text)
+            cell_table = _parse_table(cell_numbers_lines, 6)
+            final_cell_vectors = cell_table[:, :3].tolist()  # [Å]
+            final_de_dcell = cell_table[:, 3:] * HA_BOHR_TO_EV_ANG  # [eV/Å]
+
+            parameters['final_de_dcell'] = final_de_dcell.tolist()
+            parameters['final_de_dcell' + UNITS_SUFFIX] = FORCE_UNITS
+
+        final_cart_coords_lines = _get_last_block(
+            content, 'xyz-coordinates (Ang.) and forces (Hartree/Bohr)', 6, 'coordinates.forces'
+        )
+        if final_cart_coords_lines is not None:
+            # [index], [species], [Å], [Å], [Å], [Ha/Bohr], [Ha/Bohr], [Ha/Bohr]
+            final_cart_coords_table = _parse_words_table(final_cart_coords_lines, 8)
+            final_cart_values = final_cart_coords_table[:, 2:].astype(np.float64)
+            final_cart_coords = {
+                'species': final_cart_coords_table[:, 1].tolist(),
+                'coords': final_cart_values[:, :3].tolist()  # [Å]
+            }
+            final_forces = final_cart_values[:, 3:] * HA_BOHR_TO_EV_ANG  # [eV/Å]
+
+            parameters['final_forces'] = final_forces.tolist()
+            parameters['final_forces' + UNITS_SUFFIX] = FORCE_UNITS
+
+        final_frac_coords_lines = _get_last_block(content, 'Fractional coordinates of the final structure', 4, '*')
+        if final_frac_coords_lines is not None:
+            # [index], [species], [frac], [frac], [frac]
+            final_frac_coords_table = _parse_words_table(final_frac_coords_lines[:-1], 5)
+            final_frac_coords = {
+                'species': final_frac_coords_table[:, 1].tolist(),
+                'coords': final_frac_coords_table[:, 2:].astype(np.float64).tolist()  # [frac]
+            }
+
+        # written at the end of the file
+        timing_lines = _get_last_block(content, 'Computational Time (second)', 4)
+        if timing_lines is not None:
+            timing = {}  # [s]
+
+            timing['elapsed_time'] = float(timing_lines[0].strip().split()[1])
+            timing['elapsed_time' + UNITS_SUFFIX] = COMPUTATIONAL_TIME_UNITS
+
+            for timing_line in timing_lines[1:]:
+                # the timing name is the first word of the line, e.g. "readfile   =  0  0.632  0  0.632"
+                timing_words = timing_line.split()
+                if timing_words and timing_words[0] in TIMING_NAME_MAPPING:
+                    value = TIMING_NAME_MAPPING[timing_words[0]]
+                    min_id, min_time, max_id, max_time = timing_line.strip().split('=')[1].strip().split()
+                    timing_tmp = {
+                        'min_id': int(min_id),
+                        'min_time': float(min_time),
+                        'max_id': int(max_id),
+                        'max_time': float(max_time)
+                    }
+                    timing[value] = timing_tmp
+                    timing[value + UNITS_SUFFIX] = COMPUTATIONAL_TIME_UNITS
+
+            parameters = {**parameters, **timing}
 
         ## output parameters
         for energy_name, value in energies.items():
-            parameters[energy_name] = value[-1]
+            parameters[energy_name] = value
             parameters[energy_name + UNITS_SUFFIX] = ENERGY_UNITS
 
         parameters['e_fermi'] = bands['e_fermi'][-1]
@@ -380,10 +397,11 @@ class OpenmxParser(Parser):
             else:
                 final_structure = StructureData(cell=initial_structure.cell)
 
+            # `get_kind` searches the kinds of the structure on each call, so map the kind names onto kinds once
+            kind_by_name = {kind.name: kind for kind in initial_structure.kinds}
             for specie, coords in zip(final_cart_coords['species'], final_cart_coords['coords']):
                 # specie is a kind name
-                kind = initial_structure.get_kind(specie)
-                final_structure.append_atom(position=coords, symbols=kind.symbol, name=specie)
+                final_structure.append_atom(position=coords, symbols=kind_by_name[specie].symbol, name=specie)
 
             self.out('output_structure', final_structure)
 
@@ -32,15 +32,20 @@ def case_transform_dict_keys(dictionary, dict_name, func_name, transform):
     :param dictionary: dict to transform
     :param func_name: name of the transformation function used for error messages
     :param transform: transformation function
-    :returns: dictionary where keys have been converted to strings and transformed
+    :returns: dictionary where keys have been converted to strings and transformed; `dictionary` itself if all of its
+        keys are already transformed strings
     :raises: InputValidationError if case-insensitve comparison leads to duplicate keys
     """
     if not isinstance(dictionary, dict):
         raise TypeError(f'{func_name} accepts only dictionaries as argument, got {type(dictionary)}')
-    new_dict = dict((transform(str(k)), v) for k, v in dictionary.items())
+    # Keys which are already transformed strings cannot collide, so there is nothing to rebuild or check
+    if all(isinstance(k, str) and k == transform(k) for k in dictionary):
+        return dictionary
+    new_dict = {transform(str(k)): v for k, v in dictionary.items()}
+    # Transformed keys can only collide if the transformed dictionary is smaller; only then count them for the error
     if len(new_dict) != len(dictionary):
-        num_items = Counter(transform(str(k)) for k in dictionary.keys())
-        double_keys = ','.join([k for k, v in num_items if v > 1])
+        num_items = Counter(transform(str(k)) for k in dictionary)
+        double_keys = ','.join([k for k, v in num_items.items() if v > 1])
         raise exceptions.InputValidationError(
             "Inside the dictionary '{}' there are the following keys that "
             'are repeated more than once when compared case-insensitively: {}.'
@@ -73,14 +78,11 @@ def case_transform_dict_values(dictionary, func_name, transform):
     :param dictionary: dict to transform
     :param func_name: name of the transformation function used for error messages
     :param transform: transformation function
-    :returns: dictionary where string values have been transformed
+    :returns: dictionary where string values have been transformed; `dictionary` itself if all of its string values
+        are already transformed
     """
     if not isinstance(dictionary, dict):
         raise TypeError(f'{func_name} accepts only dictionaries as argument, got {type(dictionary)}')
-    new_dict = {}
-    for k, v in dictionary.items():
-        if isinstance(v, str):
-            new_dict[k] = transform(v)
-        else:
-            new_dict[k] = v
-    return new_dict
+    if all(not isinstance(v, str) or v == transform(v) for v in dictionary.values()):
+        return dictionary
+    return {k: transform(v) if isinstance(v, str) else v for k, v in dictionary.items()}
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 """Workchain to run an OpenMX calculation and calculate the density of states with DosMain."""
 from aiida import orm
-from aiida.common import AttributeDict
 from aiida.engine import WorkChain
 from aiida.plugins import CalculationFactory
 from aiida.engine import ToContext
@@ -13,7 +12,9 @@ DosmainCalculation = CalculationFactory('openmx.dosmain')
 # pylint: disable=unused-argument,no-member,inconsistent-return-statements
 def validate_inputs(inputs, ctx=None):
     """Validate the inputs of the entire input namespace."""
-    if 'DOS_FILEOUT' not in inputs.openmx.parameters.keys():
+    # `OpenmxCalculation` treats the parameter keys case-insensitively; stop at the first match instead of collecting
+    # all of the keys
+    if not any(key.upper() == 'DOS_FILEOUT' for key in inputs.openmx.parameters.keys()):
         return DosWorkChain.exit_codes.ERROR_DOS_FILEOUT_NOT_SPECIFIED.message
 
 
@@ -54,11 +55,11 @@ class DosWorkChain(WorkChain):
 
     def run_openmx(self):
         """Run the OpenmxCalculation subprocess."""
-        inputs = AttributeDict(self.exposed_inputs(OpenmxCalculation, namespace='openmx'))
+        inputs = self.exposed_inputs(OpenmxCalculation, namespace='openmx')
         inputs.metadata.call_link_label = 'openmx'
 
         running = self.submit(OpenmxCalculation, **inputs)
-        self.report(f'launching OpenmxCalculation<{running.pk}>')
+        self.report('launching OpenmxCalculation<%d>', running.pk)
 
         return ToContext(openmx_calculation=running)
 
@@ -68,12 +69,12 @@ class DosWorkChain(WorkChain):
         calculation = self.ctx.openmx_calculation
 
         if not calculation.is_finished_ok:
-            self.report(f'OpenmxCalculation failed with exit status {calculation.exit_status}')
+            self.report('OpenmxCalculation failed with exit status %s', calculation.exit_status)
             return self.exit_codes.ERROR_SUBPROCESS_FAILED_OPENMX
 
     def run_dosmain(self):
         """Run the DosmainCalculation subprocess."""
-        inputs = AttributeDict(self.exposed_inputs(DosmainCalculation, namespace='dosmain'))
+        inputs = self.exposed_inputs(DosmainCalculation, namespace='dosmain')
         openmx_calculation = self.ctx.openmx_calculation
         inputs.openmx_output_folder = openmx_calculation.outputs.remote_folder
         inputs.openmx_input_structure = openmx_calculation.inputs.structure
@@ -81,7 +82,7 @@ class DosWorkChain(WorkChain):
         inputs.metadata.call_link_label = 'dosmain'
 
         running = self.submit(DosmainCalculation, **inputs)
-        self.report(f'launching DosmainCalculation<{running.pk}>')
+        self.report('launching DosmainCalculation<%d>', running.pk)
 
         return ToContext(dosmain_calculation=running)
 
@@ -91,7 +92,7 @@ class DosWorkChain(WorkChain):
         calculation = self.ctx.dosmain_calculation
 
         if not calculation.is_finished_ok:
-            self.report(f'DosmainCalculation failed with exit status {calculation.exit_status}')
+            self.report('DosmainCalculation failed with exit status %s', calculation.exit_status)
             return self.exit_codes.ERROR_SUBPROCESS_FAILED_DOSMAIN
 
     def results(self):
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """pytest fixtures for simplified testing."""
 from __future__ import absolute_import
+import os
+
 import pytest
 pytest_plugins = ['aiida.manage.tests.pytest_fixtures']
 
@@ -10,8 +12,225 @@ def clear_database_auto(clear_database):  # pylint: disable=unused-argument
     """Automatically clear database in between tests."""
 
 
+@pytest.fixture(scope='session')
+def filepath_tests():
+    """Return the absolute filepath of the `tests` folder."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests')
+
+
+@pytest.fixture(scope='session')
+def filepath_fixtures(filepath_tests):
+    """Return the absolute filepath of the `tests/fixtures` folder."""
+    return os.path.join(filepath_tests, 'fixtures')
+
+
 @pytest.fixture(scope='function')
 def openmx_code(aiida_local_code_factory):
     """Get an openmx code."""
     openmx_code = aiida_local_code_factory(executable='openmx', entry_point='openmx')
     return openmx_code
+
+
+@pytest.fixture
+def generate_structure():
+    """Return a factory for a `StructureData` of silicon in the diamond structure."""
+
+    def _generate_structure():
+        """Return a `StructureData` of the primitive cell of diamond silicon."""
+        from aiida import orm
+
+        param = 5.43
+        cell = [[param / 2., param / 2., 0], [param / 2., 0, param / 2.], [0, param / 2., param / 2.]]
+        structure = orm.StructureData(cell=cell)
+        structure.append_atom(position=(0., 0., 0.), symbols='Si', name='Si')
+        structure.append_atom(position=(param / 4., param / 4., param / 4.), symbols='Si', name='Si')
+
+        return structure
+
+    return _generate_structure
+
+
+@pytest.fixture
+def fixture_sandbox():
+    """Return a `SandboxFolder`."""
+    from aiida.common.folders import SandboxFolder
+    with SandboxFolder() as folder:
+        yield folder
+
+
+@pytest.fixture
+def fixture_code(fixture_localhost):
+    """Return a `Code` instance configured to run calculations of given entry point on localhost `Computer`."""
+
+    def _fixture_code(entry_point_name):
+        from aiida.orm import Code
+        return Code(input_plugin_name=entry_point_name, remote_computer_exec=[fixture_localhost, '/bin/true'])
+
+    return _fixture_code
+
+
+@pytest.fixture
+def generate_kpoints_mesh():
+    """Return a factory for a `KpointsData` node with a k-point mesh."""
+
+    def _generate_kpoints_mesh(npoints):
+        """Return a `KpointsData` with a mesh of `npoints` along each reciprocal lattice vector."""
+        from aiida.orm import KpointsData
+
+        kpoints = KpointsData()
+        kpoints.set_kpoints_mesh([npoints] * 3)
+
+        return kpoints
+
+    return _generate_kpoints_mesh
+
+
+@pytest.fixture
+def generate_vps(filepath_fixtures):
+    """Return a factory for a `VpsData` node from the pseudopotential files in `tests/fixtures/pseudos`."""
+
+    def _generate_vps(filename='Si_PBE19.vps'):
+        from aiida_pseudo.data.pseudo import VpsData
+        with open(os.path.join(filepath_fixtures, 'pseudos', filename), 'rb') as handle:
+            return VpsData(handle, filename=filename)
+
+    return _generate_vps
+
+
+@pytest.fixture
+def generate_pao(filepath_fixtures):
+    """Return a factory for a `PaoData` node from the orbital files in `tests/fixtures/orbitals`."""
+
+    def _generate_pao(filename='Si7.0.pao'):
+        from aiida_basis.data.basis import PaoData
+        with open(os.path.join(filepath_fixtures, 'orbitals', filename), 'rb') as handle:
+            return PaoData(handle, filename=filename)
+
+    return _generate_pao
+
+
+@pytest.fixture
+def generate_inputs_openmx(fixture_code, generate_structure, generate_kpoints_mesh, generate_vps, generate_pao):
+    """Return a factory for a minimal set of inputs of an `OpenmxCalculation` for diamond silicon."""
+
+    def _generate_inputs_openmx():
+        import numpy as np
+        from aiida import orm
+
+        orbital_configurations = orm.ArrayData()
+        orbital_configurations.set_array('Si', np.array([2, 2, 1, 0]))
+
+        return {
+            'code': fixture_code('openmx.openmx'),
+            'structure': generate_structure(),
+            'kpoints': generate_kpoints_mesh(2),
+            'parameters': orm.Dict(dict={
+                'SCF_EIGENVALUESOLVER': 'band',
+                'SCF_ENERGYCUTOFF': 200.0
+            }),
+            'orbital_configurations': orbital_configurations,
+            'pseudos': {
+                'Si': generate_vps()
+            },
+            'orbitals': {
+                'Si': generate_pao()
+            },
+            'metadata': {
+                'options': {
+                    'resources': {
+                        'num_machines': 1
+                    },
+                    'max_wallclock_seconds': 1800,
+                    'withmpi': False,
+                }
+            }
+        }
+
+    return _generate_inputs_openmx
+
+
+@pytest.fixture
+def generate_calc_job():
+    """Return a factory to instantiate a `CalcJob` and call its `prepare_for_submission` method."""
+
+    def _generate_calc_job(folder, entry_point_name, inputs=None):
+        """Instantiate the `CalcJob` of `entry_point_name` and prepare it for submission in `folder`.
+
+        :param folder: a `Folder` in which to write the input files
+        :param entry_point_name: entry point name of the calculation class
+        :param inputs: dictionary of inputs of the calculation
+        :returns: the `CalcInfo` returned by `prepare_for_submission`
+        """
+        from aiida.engine.utils import instantiate_process
+        from aiida.manage.manager import get_manager
+        from aiida.plugins import CalculationFactory
+
+        runner = get_manager().get_runner()
+        process = instantiate_process(runner, CalculationFactory(entry_point_name), **inputs or {})
+
+        return process.prepare_for_submission(folder)
+
+    return _generate_calc_job
+
+
+@pytest.fixture
+def generate_calc_job_node(fixture_localhost, filepath_fixtures):
+    """Return a factory for a stored `CalcJobNode` with the retrieved outputs of a test fixture."""
+
+    def _generate_calc_job_node(entry_point_name, test_name, inputs=None):
+        """Return a stored `CalcJobNode` whose `retrieved` folder contains the files of a test fixture.
+
+        :param entry_point_name: entry point name of the calculation class, e.g. `openmx.openmx`
+        :param test_name: name of the fixture subfolder in `tests/fixtures/parsers/<entry_point_name>`
+        :param inputs: optional dictionary of input nodes to be linked to the node
+        :returns: `CalcJobNode` instance with an attached `FolderData` as the `retrieved` node
+        """
+        from aiida import orm
+        from aiida.common import LinkType
+        from aiida.plugins.entry_point import format_entry_point_string
+
+        entry_point = format_entry_point_string('aiida.calculations', entry_point_name)
+
+        node = orm.CalcJobNode(computer=fixture_localhost, process_type=entry_point)
+        node.set_option('resources', {'num_machines': 1, 'num_mpiprocs_per_machine': 1})
+        node.set_option('max_wallclock_seconds', 1800)
+
+        for link_label, input_node in (inputs or {}).items():
+            input_node.store()
+            node.add_incoming(input_node, link_type=LinkType.INPUT_CALC, link_label=link_label)
+
+        node.store()
+
+        filepath_folder = os.path.join(filepath_fixtures, 'parsers', entry_point_name.split('.')[-1], test_name)
+        retrieved = orm.FolderData()
+        retrieved.put_object_from_tree(filepath_folder)
+        retrieved.add_incoming(node, link_type=LinkType.CREATE, link_label='retrieved')
+        retrieved.store()
+
+        return node
+
+    return _generate_calc_job_node
+
+
+@pytest.fixture
+def fixture_localhost(aiida_localhost):
+    """Return a localhost `Computer`."""
+    localhost = aiida_localhost
+    localhost.set_default_mpiprocs_per_machine(1)
+    return localhost
+
+
+@pytest.fixture(scope='session')
+def generate_parser():
+    """Return a factory for the `Parser` class registered under an entry point name."""
+
+    def _generate_parser(entry_point_name):
+        """Return the `Parser` class registered under `entry_point_name`.
+
+        :param entry_point_name: entry point name of the parser class
+        :returns: `Parser` subclass
+        """
+        from aiida.plugins import ParserFactory
+        return ParserFactory(entry_point_name)
+
+    return _generate_parser
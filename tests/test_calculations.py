@@ -1,2 +1,161 @@
 # -*- coding: utf-8 -*-
 """Tests for the aiida-openmx CalcJobs."""
+import collections
+
+import pytest
+
+from aiida import orm
+from aiida.common import exceptions
+from aiida.common.folders import SandboxFolder
+
+from aiida_openmx.calculations import openmx as openmx_calculations
+
+
+def test_openmx_default(fixture_sandbox, generate_calc_job, generate_inputs_openmx):
+    """Test that the pseudopotential and orbital files are copied from the repository by default."""
+    inputs = generate_inputs_openmx()
+    calc_info = generate_calc_job(fixture_sandbox, 'openmx.openmx', inputs)
+
+    pseudo = inputs['pseudos']['Si']
+    orbital = inputs['orbitals']['Si']
+    assert sorted(calc_info.local_copy_list) == sorted([
+        (pseudo.uuid, 'Si_PBE19.vps', './VPS/Si_PBE19.vps'),
+        (orbital.uuid, 'Si7.0.pao', './PAO/Si7.0.pao'),
+    ])
+    assert calc_info.remote_symlink_list == []
+    assert calc_info.retrieve_list == ['aiida.out']
+    assert sorted(fixture_sandbox.get_content_list()) == ['PAO', 'VPS', 'aiida.in']
+
+
+def test_openmx_shared_dirs(fixture_sandbox, generate_calc_job, generate_inputs_openmx, fixture_localhost):
+    """Test that the files are symlinked from the shared directories on the remote computer."""
+    inputs = generate_inputs_openmx()
+    inputs['settings'] = orm.Dict(dict={'shared_pseudo_dir': '/shared/VPS', 'shared_orbital_dir': '/shared/PAO/'})
+    calc_info = generate_calc_job(fixture_sandbox, 'openmx.openmx', inputs)
+
+    assert calc_info.local_copy_list == []
+    assert calc_info.remote_symlink_list == [
+        (fixture_localhost.uuid, '/shared/VPS/Si_PBE19.vps', './VPS/Si_PBE19.vps'),
+        (fixture_localhost.uuid, '/shared/PAO/Si7.0.pao', './PAO/Si7.0.pao'),
+    ]
+
+
+def test_openmx_shared_pseudo_dir(fixture_sandbox, generate_calc_job, generate_inputs_openmx, fixture_localhost):
+    """Test that only the pseudopotential files are symlinked if only `SHARED_PSEUDO_DIR` is set."""
+    inputs = generate_inputs_openmx()
+    inputs['settings'] = orm.Dict(dict={'SHARED_PSEUDO_DIR': '/shared/VPS'})
+    calc_info = generate_calc_job(fixture_sandbox, 'openmx.openmx', inputs)
+
+    assert calc_info.local_copy_list == [(inputs['orbitals']['Si'].uuid, 'Si7.0.pao', './PAO/Si7.0.pao')]
+    assert calc_info.remote_symlink_list == [
+        (fixture_localhost.uuid, '/shared/VPS/Si_PBE19.vps', './VPS/Si_PBE19.vps'),
+    ]
+
+
+@pytest.mark.parametrize('setting_name', ('SHARED_PSEUDO_DIR', 'SHARED_ORBITAL_DIR'))
+@pytest.mark.parametrize('remote_dir', ('shared/VPS', '', 1, ['/shared/VPS']))
+def test_openmx_shared_dir_invalid(
+    fixture_sandbox, generate_calc_job, generate_inputs_openmx, setting_name, remote_dir
+):
+    """Test that a shared directory which is not an absolute path is rejected."""
+    inputs = generate_inputs_openmx()
+    inputs['settings'] = orm.Dict(dict={setting_name: remote_dir})
+
+    with pytest.raises(exceptions.InputValidationError, match=setting_name):
+        generate_calc_job(fixture_sandbox, 'openmx.openmx', inputs)
+
+
+@pytest.fixture
+def input_file_generations(monkeypatch):
+    """Start from an empty input file cache and return the list of calculations which generated their input file."""
+    generations = []
+    generate_input_file = openmx_calculations.OpenmxCalculation._generate_input_file  # pylint: disable=protected-access
+
+    def _generate_input_file(self):
+        generations.append(self)
+        return generate_input_file(self)
+
+    monkeypatch.setattr(openmx_calculations.OpenmxCalculation, '_generate_input_file', _generate_input_file)
+    monkeypatch.setattr(openmx_calculations, '_INPUT_FILE_CACHE', collections.OrderedDict())
+    return generations
+
+
+def _store_inputs(inputs):
+    """Store the input nodes from which the input file is generated."""
+    for key in ('structure', 'kpoints', 'parameters', 'orbital_configurations'):
+        inputs[key].store()
+    for node in list(inputs['pseudos'].values()) + list(inputs['orbitals'].values()):
+        node.store()
+    return inputs
+
+
+def _prepare_input_file(generate_calc_job, inputs):
+    """Prepare a calculation for submission in a new sandbox folder and return its input file content."""
+    with SandboxFolder() as folder:
+        generate_calc_job(folder, 'openmx.openmx', inputs)
+        with folder.open('aiida.in') as handle:
+            return handle.read()
+
+
+def test_openmx_input_file_cache_hit(generate_calc_job, generate_inputs_openmx, input_file_generations):
+    """Test that the input file is generated only once for the same stored input nodes."""
+    inputs = _store_inputs(generate_inputs_openmx())
+
+    content = _prepare_input_file(generate_calc_job, inputs)
+    assert _prepare_input_file(generate_calc_job, inputs) == content
+    assert len(input_file_generations) == 1
+    assert len(openmx_calculations._INPUT_FILE_CACHE) == 1  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize(
+    'input_name', ('structure', 'kpoints', 'parameters', 'orbital_configurations', 'pseudos', 'orbitals')
+)
+def test_openmx_input_file_cache_miss(generate_calc_job, generate_inputs_openmx, input_file_generations, input_name):
+    """Test that the input file is generated again if any of the input nodes differs."""
+    inputs = _store_inputs(generate_inputs_openmx())
+    _prepare_input_file(generate_calc_job, inputs)
+
+    # Replace a single input with other, equivalent nodes
+    other_inputs = dict(inputs)
+    other_inputs[input_name] = generate_inputs_openmx()[input_name]
+    _prepare_input_file(generate_calc_job, _store_inputs(other_inputs))
+
+    assert len(input_file_generations) == 2
+    assert len(openmx_calculations._INPUT_FILE_CACHE) == 2  # pylint: disable=protected-access
+
+
+def test_openmx_input_file_cache_unstored(generate_calc_job, generate_inputs_openmx, input_file_generations):
+    """Test that the input file is not cached if any of the input nodes is not stored."""
+    inputs = _store_inputs(generate_inputs_openmx())
+    inputs['parameters'] = orm.Dict(dict=inputs['parameters'].get_dict())
+    # Without provenance the unstored input nodes are not stored when the process is instantiated
+    inputs['metadata']['store_provenance'] = False
+
+    content = _prepare_input_file(generate_calc_job, inputs)
+    assert not inputs['parameters'].is_stored
+    assert _prepare_input_file(generate_calc_job, inputs) == content
+    assert len(input_file_generations) == 2
+    assert not openmx_calculations._INPUT_FILE_CACHE  # pylint: disable=protected-access
+
+
+def test_openmx_input_file_cache_eviction(
+    generate_calc_job, generate_inputs_openmx, input_file_generations, monkeypatch
+):
+    """Test that the least recently used input file is evicted once the cache is full."""
+    monkeypatch.setattr(openmx_calculations, '_INPUT_FILE_CACHE_SIZE', 2)
+    inputs_a = _store_inputs(generate_inputs_openmx())
+    inputs_b = _store_inputs(generate_inputs_openmx())
+    inputs_c = _store_inputs(generate_inputs_openmx())
+
+    _prepare_input_file(generate_calc_job, inputs_a)
+    _prepare_input_file(generate_calc_job, inputs_b)
+    # Using `a` again makes `b` the least recently used entry, which is then evicted by `c`
+    _prepare_input_file(generate_calc_job, inputs_a)
+    _prepare_input_file(generate_calc_job, inputs_c)
+    assert len(input_file_generations) == 3
+    assert len(openmx_calculations._INPUT_FILE_CACHE) == 2  # pylint: disable=protected-access
+
+    _prepare_input_file(generate_calc_job, inputs_a)
+    assert len(input_file_generations) == 3
+    _prepare_input_file(generate_calc_job, inputs_b)
+    assert len(input_file_generations) == 4
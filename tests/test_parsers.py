@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Tests for the aiida-openmx Parsers."""
+import numpy as np
+import pytest
+
+from aiida import orm
+
+
+def _generate_dosmain_inputs(dos_method='tetrahedron'):
+    """Return the input nodes of a `DosmainCalculation` computing the total DOS."""
+    return {'dos_type': orm.Str('dos'), 'dos_method': orm.Str(dos_method)}
+
+
+def test_dosmain_default(generate_calc_job_node, generate_parser):
+    """Test parsing the total DOS written by DosMain with the tetrahedron method."""
+    node = generate_calc_job_node('openmx.dosmain', 'default', _generate_dosmain_inputs())
+    parser = generate_parser('openmx.dosmain')
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert 'output_dos' in results
+
+    energies = results['output_dos'].get_array('energies')
+    dos = results['output_dos'].get_array('dos')
+    assert energies.shape == (41,)
+    assert dos.shape == (41, 2)
+    assert dos.dtype == np.float64
+    assert energies[0] == -14.0
+    assert energies[-1] == 6.0
+    np.testing.assert_array_equal(dos[1], [0.02962566, 0.01481283])
+    np.testing.assert_array_equal(dos[-1], [0.67082039, 12.48367587])
+
+
+def test_dosmain_ragged(generate_calc_job_node, generate_parser):
+    """Test that a DOS file whose rows have different numbers of columns is a parsing error."""
+    node = generate_calc_job_node('openmx.dosmain', 'ragged', _generate_dosmain_inputs())
+    parser = generate_parser('openmx.dosmain')
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_failed
+    assert calcfunction.exit_status == node.process_class.exit_codes.ERROR_OUTPUT_DOS_PARSE.status
+    assert 'output_dos' not in results
+
+
+def test_dosmain_missing(generate_calc_job_node, generate_parser):
+    """Test that a missing DOS file is reported."""
+    node = generate_calc_job_node('openmx.dosmain', 'missing', _generate_dosmain_inputs())
+    parser = generate_parser('openmx.dosmain')
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_failed
+    assert calcfunction.exit_status == node.process_class.exit_codes.ERROR_OUTPUT_DOS_MISSING.status
+    assert 'output_dos' not in results
+
+
+def _generate_openmx_inputs(generate_structure, md_type):
+    """Return the input nodes of an `OpenmxCalculation` needed by the parser."""
+    return {'structure': generate_structure(), 'parameters': orm.Dict(dict={'MD_TYPE': md_type})}
+
+
+def test_openmx_default(generate_calc_job_node, generate_parser, generate_structure):
+    """Test parsing the stdout of a cell optimization of silicon."""
+    inputs = _generate_openmx_inputs(generate_structure, 'optc4')
+    node = generate_calc_job_node('openmx.openmx', 'default', inputs)
+    parser = generate_parser('openmx.openmx')
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert 'output_parameters' in results
+    assert 'output_structure' in results
+
+    parameters = results['output_parameters'].get_dict()
+
+    # Header
+    assert parameters['openmx_version'] == '3.9.2'
+    assert parameters['mpi_procs'] == 4
+    assert parameters['omp_threads'] == 2
+    assert parameters['3d_fft_grid'] == [32, 32, 32]
+    assert parameters['true_scf_ecut'] == pytest.approx([2993.25246268] * 3)
+
+    # Energies and eigenvalue header of the last MD step
+    assert parameters['u_tot'] == pytest.approx(-217.332539162)
+    assert parameters['u_tot_units'] == 'eV'
+    assert parameters['enthalpy'] == pytest.approx(-217.332539162)
+    assert parameters['u_band'] == pytest.approx(-100.420142854)
+    assert parameters['u_kinetic'] == pytest.approx(81.123482517)
+    assert parameters['u_xc_alpha'] == pytest.approx(-33.306127027)
+    assert parameters['u_hubbard'] == 0.0
+    assert parameters['e_fermi'] == pytest.approx(5.378203098)
+    assert parameters['n_states'] == 8.0
+
+    # Dipole moment
+    assert parameters['abs_dipole_mom'] == pytest.approx(1.2e-07)
+    assert parameters['total_dipole'] == pytest.approx([1e-07, 5e-08, 3e-08])
+    assert parameters['electron_dipole'] == pytest.approx([1e-07, 5e-08, 3e-08])
+    assert parameters['background_dipole'] == [0.0, 0.0, 0.0]
+    assert parameters['total_dipole_units'] == 'Debye'
+
+    # Cell derivatives and forces of the final structure
+    de_dcell = 0.073178744
+    assert parameters['final_de_dcell'] == [
+        pytest.approx([0.0, -de_dcell, -de_dcell]),
+        pytest.approx([-de_dcell, 0.0, -de_dcell]),
+        pytest.approx([-de_dcell, -de_dcell, 0.0]),
+    ]
+    force = 0.010978611
+    assert parameters['final_forces'] == [pytest.approx([force] * 3), pytest.approx([-force] * 3)]
+
+    # Timings
+    assert parameters['elapsed_time'] == 41.322
+    assert parameters['elapsed_time_units'] == 's'
+    assert parameters['read_input'] == {'min_id': 0, 'min_time': 9.212, 'max_id': 3, 'max_time': 9.22}
+    assert parameters['diag'] == {'min_id': 2, 'min_time': 7.815, 'max_id': 0, 'max_time': 7.912}
+    assert parameters['other'] == {'min_id': 2, 'min_time': 0.498, 'max_id': 0, 'max_time': 0.531}
+
+    # Final structure
+    structure = results['output_structure']
+    assert structure.cell == [
+        pytest.approx([0.0, 2.7305364, 2.7305364]),
+        pytest.approx([2.7305364, 0.0, 2.7305364]),
+        pytest.approx([2.7305364, 2.7305364, 0.0]),
+    ]
+    assert [site.kind_name for site in structure.sites] == ['Si', 'Si']
+    assert structure.sites[0].position == pytest.approx((0.0, 0.0, 0.0))
+    assert structure.sites[1].position == pytest.approx((1.3652682, 1.3652682, 1.3652682))
+
+
+def test_openmx_nomd(generate_calc_job_node, generate_parser, generate_structure):
+    """Test that no output structure is returned for a calculation without MD or geometry optimization."""
+    inputs = _generate_openmx_inputs(generate_structure, 'nomd')
+    node = generate_calc_job_node('openmx.openmx', 'default', inputs)
+    parser = generate_parser('openmx.openmx')
+    results, calcfunction = parser.parse_from_node(node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok, calcfunction.exit_message
+    assert 'output_parameters' in results
+    assert 'output_structure' not in results